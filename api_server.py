@@ -1,51 +1,157 @@
 from fastapi import FastAPI, UploadFile, Form
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from skills_extractor import process_skills
+import html
+import io
+import logging
+import re
 import shutil
 import os
-import uuid
+import tempfile
 import traceback
+from typing import Optional
+from urllib.parse import quote
 
 app = FastAPI()
+log = logging.getLogger(__name__)
+
+# Copy uploads in 1 MiB chunks (shutil defaults to 64 KiB outside Windows)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Literal "\n" escapes and Windows line endings both become plain newlines
+NEWLINE_RE = re.compile(r"\\n|\r\n")
+
+XLSX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+
+def save_upload(file: UploadFile) -> str:
+    """
+    Copy an uploaded file to a new temp file and return its path.
+
+    Blocking, so it is run off the event loop. NamedTemporaryFile creates the
+    file atomically in the platform temp dir (Windows, Mac and Linux).
+    """
+    suffix = "_" + os.path.basename(file.filename)
+    with tempfile.NamedTemporaryFile(
+        prefix="tmp_", suffix=suffix, delete=False
+    ) as buffer:
+        try:
+            shutil.copyfileobj(file.file, buffer, COPY_BUFFER_SIZE)
+        except BaseException:
+            buffer.close()
+            os.unlink(buffer.name)
+            raise
+    return buffer.name
+
+
+def write_review(
+    excel_path: str,
+    sheet: str,
+    client: str,
+    sender: str,
+    dest_path: str,
+    max_col: Optional[int] = None,
+    max_row: Optional[int] = None,
+) -> dict:
+    """
+    Run process_skills into a staging file and atomically swap it into place.
+
+    Blocking, so it is run off the event loop. The staging file sits in the
+    destination directory, so concurrent uploads with the same name never
+    write the same file, a failed run never clobbers the previous review, and
+    os.replace stays a same-device rename rather than a copy.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(dest_path), prefix="tmp_", suffix=".xlsx",
+        delete=False
+    ) as staging:
+        pass
+    try:
+        result = process_skills(
+            excel_path,
+            sheet,
+            client,
+            sender,
+            staging.name,
+            max_col=max_col,
+            max_row=max_row,
+        )
+        os.replace(staging.name, dest_path)
+    except BaseException:
+        os.unlink(staging.name)
+        raise
+    result["output_file"] = dest_path
+    return result
 
 @app.post("/extract")
 async def extract(
     file: UploadFile,
     sheet: str = Form(...),
     client: str = Form(...),
-    sender: str = Form(...)
+    sender: str = Form(...),
+    download: bool = Form(False),
+    max_col: Optional[int] = Form(None, ge=1),
+    max_row: Optional[int] = Form(None, ge=1)
 ):
+    """
+    Build the skills review workbook for an uploaded file.
+
+    By default the workbook is saved on the server and a JSON body with the
+    output path, ``message`` and ``message_html`` is returned. With
+    ``download=true`` the workbook itself is returned as an attachment and
+    the share message is sent URL-encoded in the ``X-Share-Message`` header.
+    ``max_col`` and ``max_row`` optionally bound the cells read from each
+    sheet.
+    """
     try:
         # Save uploaded file temporarily (local temp dir)
-#        temp_filename = f"C:/Users/jared/AppData/Local/Temp/tmp_{uuid.uuid4()}_{file.filename}"
-        import tempfile
-
-        # Use a universal temp directory that works on Windows, Mac, and Linux
-        temp_dir = tempfile.gettempdir()
-        temp_filename = os.path.join(temp_dir, f"tmp_{uuid.uuid4()}_{file.filename}")
- 
-        with open(temp_filename, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Run extractor using the temp file
-        result = process_skills(temp_filename, sheet, client, sender)
-
-        # Move review file back beside original, but clean the name
-        review_path = result["output_file"]
-#        original_dir = "C:/Users/jared/OneDrive/_PTP"
-        # Save output next to input if local, otherwise current working dir
-        if os.name == "nt":  # Windows
-            original_dir = "C:/Users/jared/OneDrive/_PTP"
-        else:
-            original_dir = os.getcwd()
-
-
-        if os.path.exists(review_path):
-            base_name = os.path.basename(file.filename)
-            review_name = os.path.splitext(base_name)[0] + "_review.xlsx"
-            dest_path = os.path.join(original_dir, review_name)
-            shutil.move(review_path, dest_path)
-            result["output_file"] = dest_path
+        temp_filename = await run_in_threadpool(save_upload, file)
+
+        base_name = os.path.basename(file.filename)
+        review_name = os.path.splitext(base_name)[0] + "_review.xlsx"
+
+        # Run extractor using the temp file in a worker thread so the event
+        # loop keeps serving other requests while the workbook is parsed
+        try:
+            if download:
+                # Build the review file in memory and send it back, so
+                # nothing is written on the server
+                output = io.BytesIO()
+                result = await run_in_threadpool(
+                    process_skills,
+                    temp_filename,
+                    sheet,
+                    client,
+                    sender,
+                    output,
+                    max_col=max_col,
+                    max_row=max_row,
+                )
+            else:
+                # Write the review file beside the original, but clean the
+                # name, so it never has to be moved out of the temp dir
+#                original_dir = "C:/Users/jared/OneDrive/_PTP"
+                # Save output next to input if local, otherwise current working dir
+                if os.name == "nt":  # Windows
+                    original_dir = "C:/Users/jared/OneDrive/_PTP"
+                else:
+                    original_dir = os.getcwd()
+                result = await run_in_threadpool(
+                    write_review,
+                    temp_filename,
+                    sheet,
+                    client,
+                    sender,
+                    os.path.join(original_dir, review_name),
+                    max_col=max_col,
+                    max_row=max_row,
+                )
+        finally:
+            # The uploaded copy is only needed while the workbook is parsed
+            os.unlink(temp_filename)
 
         # Close file handle
         try:
@@ -55,27 +161,35 @@ async def extract(
 
         # Make message more readable
         raw_message = result["message"]
-        formatted_message = (
-            raw_message.replace("\\n", "\n")
-                       .replace("\r\n", "\n")
-                       .strip()
-        )
+        formatted_message = NEWLINE_RE.sub("\n", raw_message).strip()
 
-        # Build HTML version for GPT or email display
+        # Build HTML version for GPT or email display (names are user input,
+        # so escape them before adding markup)
         html_message = (
-            "<p>" + formatted_message.replace("\n\n", "</p><p>")
-                                     .replace("\n", "<br>") + "</p>"
+            "<p>" + html.escape(formatted_message, quote=False)
+                        .replace("\n\n", "</p><p>")
+                        .replace("\n", "<br>") + "</p>"
         )
 
         result["message"] = formatted_message
         result["message_html"] = html_message
 
-        # Console preview
-        print("\n" + "=" * 60)
-        print("📬  SHARE MESSAGE PREVIEW:")
-        print("-" * 60)
-        print(formatted_message)
-        print("=" * 60 + "\n")
+        # Console preview (debug only, so stdout is not a per-request bottleneck)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("📬  SHARE MESSAGE PREVIEW:\n%s", formatted_message)
+
+        if download:
+            # The workbook is already complete in memory, so send it as one
+            # body; the share message travels URL-encoded in a header
+            return Response(
+                content=output.getvalue(),
+                media_type=XLSX_MEDIA_TYPE,
+                headers={
+                    "Content-Disposition":
+                        f"attachment; filename*=UTF-8''{quote(review_name)}",
+                    "X-Share-Message": quote(formatted_message),
+                },
+            )
 
         # Return JSON
         return JSONResponse(content={"result": result})
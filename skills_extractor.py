@@ -27,69 +27,161 @@ Examples:
 The generated workbook will contain a sheet called ``Skills Review`` with
 two columns: ``Skill`` and ``Have skill? (Mark X or YES)``. Skills found
 in the first column of the input sheet are automatically marked with
-``Yes`` in the second column.
+``Yes`` in the second column, ignoring differences in case.
 
 Dependencies
 ------------
 
-This script relies on `pandas` for data handling and `openpyxl` for
-creating Excel files. Make sure both packages are installed in your
-environment.
+This script relies on `openpyxl` for streaming the source workbook (in
+read-only mode) and `XlsxWriter` for creating Excel files. Make sure both
+packages are installed in your environment.
 
 """
 
 import argparse
+import os
 from pathlib import Path
-from typing import List, Optional
-
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.worksheet.table import Table, TableStyleInfo
-
-
-def flatten_values(values: List[str]) -> List[str]:
-    """Split values by commas and newlines and strip whitespace."""
-    flattened: List[str] = []
-    for val in values:
-        if not isinstance(val, str):
-            val = str(val)
-        for part in val.replace("\n", ",").split(","):
-            part = part.strip()
-            if part:
-                flattened.append(part)
-    return flattened
-
-
-def extract_unique_skills(
-    excel_path: Path, sheet: Optional[str] = None
-) -> List[str]:
-    """Read all cells from the specified sheet and return a sorted list of unique skills."""
-    xls = pd.ExcelFile(excel_path)
-    sheet_names = [sheet] if sheet else xls.sheet_names
-    all_skills: List[str] = []
-    for sheet_name in sheet_names:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
-        for col in df.columns:
-            col_values = df[col].dropna().tolist()
-            all_skills.extend(flatten_values(col_values))
-    # Deduplicate and sort (case‑insensitive)
-    unique_skills = sorted(set(all_skills), key=lambda s: s.lower())
-    return unique_skills
-
-
-def determine_linkedin_skills(
-    df: pd.DataFrame
-) -> set:
-    """Return a set of skills listed in the first column of the DataFrame."""
-    first_col = df.columns[0]
-    values = df[first_col].dropna().tolist()
-    return set(flatten_values(values))
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import xlsxwriter
+from openpyxl import Workbook, load_workbook
+
+if TYPE_CHECKING:
+    # Private openpyxl module, only needed for annotations
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+REVIEW_HEADERS = ["Skill", "Have skill? (Mark X or YES)"]
+REVIEW_COLUMN_WIDTHS = [45, 30]
+LINKEDIN_MARK = "Yes"
+SHARE_MESSAGE_TEMPLATE = (
+    "Hi {client},\n\n"
+    "I've compiled a list of possible job titles and their skills for you."
+    " Your current LinkedIn skills are already marked."
+    " Please review the list and mark 'Yes' in the second column for any"
+    " additional skills you have.\n\n"
+    "Thanks,\n"
+    "{sender}"
+)
+
+
+def flatten_into(values: Iterable[object], out: Set[str]) -> None:
+    """Split values by commas and newlines, strip whitespace and add them to ``out``."""
+    # str() returns str values unchanged, so no isinstance check is needed
+    out.update(
+        skill
+        for val in values
+        for part in str(val).replace("\n", ",").split(",")
+        if (skill := part.strip())
+    )
+
+
+def iter_sheet_values(
+    ws: "ReadOnlyWorksheet",
+    first_column: Optional[List[object]] = None,
+    max_col: Optional[int] = None,
+    max_row: Optional[int] = None,
+) -> Iterator[object]:
+    """
+    Yield every non-empty cell value below the header row of a worksheet.
+
+    When ``first_column`` is given, non-empty values from the first column
+    are appended to it instead of being yielded. ``max_col`` and ``max_row``
+    bound the cells read; parsing stops once ``max_row`` has been reached.
+    """
+    skip = 0 if first_column is None else 1
+    rows = ws.iter_rows(
+        min_row=2, max_col=max_col, max_row=max_row, values_only=True
+    )
+    for row in rows:
+        if skip and row and row[0] is not None:
+            first_column.append(row[0])
+        for val in row[skip:]:
+            if val is not None:
+                yield val
+
+
+def extract_skills(
+    worksheets: Sequence["ReadOnlyWorksheet"],
+    max_col: Optional[int] = None,
+    max_row: Optional[int] = None,
+) -> Tuple[List[str], FrozenSet[str]]:
+    """
+    Read all cells from the given worksheets in a single pass.
+
+    Returns the sorted list of unique skills together with the casefolded
+    LinkedIn skills found in the first column of the first worksheet. See
+    :func:`iter_sheet_values` for ``max_col`` and ``max_row``.
+    """
+    unique: Set[str] = set()
+    linkedin_values: List[object] = []
+    for index, ws in enumerate(worksheets):
+        first_column = linkedin_values if index == 0 else None
+        flatten_into(
+            iter_sheet_values(ws, first_column, max_col, max_row), unique
+        )
+    linkedin: Set[str] = set()
+    flatten_into(linkedin_values, linkedin)
+    unique |= linkedin
+    linkedin_mask = frozenset(skill.casefold() for skill in linkedin)
+    # Sort case‑insensitively. Each skill is casefolded once and paired with
+    # itself, which also orders "Python"/"python" stably.
+    decorated = sorted((skill.casefold(), skill) for skill in unique)
+    return [skill for _, skill in decorated], linkedin_mask
+
+
+def open_workbook(excel_path: Path) -> Workbook:
+    """Open a workbook in read-only mode for streaming cell values."""
+    # Only cached cell values are needed: skip formulas and external links
+    return load_workbook(
+        excel_path, read_only=True, data_only=True, keep_links=False
+    )
+
+
+def read_skills(
+    excel_path: Path,
+    sheet: Optional[str] = None,
+    max_col: Optional[int] = None,
+    max_row: Optional[int] = None,
+) -> Tuple[List[str], FrozenSet[str]]:
+    """
+    Stream the workbook once and return the unique skills and LinkedIn skills.
+
+    When ``sheet`` is given only that sheet is scanned; otherwise every sheet
+    is scanned and the first one is used for the LinkedIn skills.
+    ``max_col`` and ``max_row`` limit the cells read from each sheet and
+    must be at least 1 when given.
+    """
+    for name, bound in (("max_col", max_col), ("max_row", max_row)):
+        # openpyxl treats 0 as "no bound", so reject it rather than read everything
+        if bound is not None and bound < 1:
+            raise ValueError(f"{name} must be at least 1, got {bound}")
+    wb = open_workbook(excel_path)
+    try:
+        worksheets = [wb[sheet]] if sheet else wb.worksheets
+        for ws in worksheets:
+            # Some writers store a wrong <dimension>; read the rows actually present
+            ws.reset_dimensions()
+        return extract_skills(worksheets, max_col, max_row)
+    finally:
+        wb.close()
 
 
 def create_review_workbook(
     skills: List[str],
-    linkedin_skills: set,
-    output_path: Path,
+    linkedin_skills: FrozenSet[str],
+    output_path: Union[Path, BinaryIO],
     table_style_name: str = "TableStyleMedium9",
     show_row_stripes: bool = True,
     show_column_stripes: bool = False,
@@ -102,9 +194,10 @@ def create_review_workbook(
     ----------
     skills : List[str]
         The list of unique skills to include.
-    linkedin_skills : set
-        A set of skills that should be pre‑marked as "Yes".
-    output_path : Path
+    linkedin_skills : FrozenSet[str]
+        Casefolded skills that should be pre‑marked as "Yes", regardless of
+        how their case differs in the skill list.
+    output_path : Path or binary file-like object
         Where to save the resulting workbook.
     table_style_name : str, optional
         The name of the Excel table style to use. Defaults to 'TableStyleMedium9'.
@@ -113,52 +206,54 @@ def create_review_workbook(
     show_column_stripes : bool, optional
         Whether to show alternating column colours.
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Skills Review"
-    # Write header
-    ws["A1"] = "Skill"
-    ws["B1"] = "Have skill? (Mark X or YES)"
-    # Write skills and prefill LinkedIn skills
-    for idx, skill in enumerate(skills, start=2):
-        ws[f"A{idx}"] = skill
-        if skill in linkedin_skills:
-            ws[f"B{idx}"] = "Yes"
+    # in_memory builds the parts in memory rather than in temp files, and is
+    # required when writing to a file-like object
+    wb = xlsxwriter.Workbook(
+        output_path, {"strings_to_numbers": False, "in_memory": True}
+    )
+    ws = wb.add_worksheet("Skills Review")
     # Adjust column widths
-    ws.column_dimensions["A"].width = 45
-    ws.column_dimensions["B"].width = 30
+    for col, width in enumerate(REVIEW_COLUMN_WIDTHS):
+        ws.set_column(col, col, width)
 
     # Freeze the first row so headers remain visible when scrolling
-    # Freeze panes at the first cell below the header row (A2)
-    ws.freeze_panes = "A2"
-    # Define table range
-    end_row = len(skills) + 1
-    table_ref = f"A1:B{end_row}"
-    table = Table(displayName="SkillsTable", ref=table_ref)
-    # Apply style with alternating colours
-    style = TableStyleInfo(
-        name=table_style_name,
-        showFirstColumn=False,
-        showLastColumn=False,
-        showRowStripes=show_row_stripes,
-        showColumnStripes=show_column_stripes,
+    ws.freeze_panes(1, 0)
+    # Write skills and prefill LinkedIn skills; bind the writer once since
+    # this loop runs for every skill
+    write_string = ws.write_string
+    for row, skill in enumerate(skills, start=1):
+        write_string(row, 0, skill)
+        if skill.casefold() in linkedin_skills:
+            write_string(row, 1, LINKEDIN_MARK)
+    # The table writes the header row and applies the alternating colours;
+    # Excel tables need at least one (possibly blank) data row
+    ws.add_table(
+        0,
+        0,
+        max(len(skills), 1),
+        1,
+        {
+            "name": "SkillsTable",
+            "style": table_style_name,
+            "banded_rows": show_row_stripes,
+            "banded_columns": show_column_stripes,
+            "columns": [{"header": header} for header in REVIEW_HEADERS],
+        },
     )
-    table.tableStyleInfo = style
-    ws.add_table(table)
-    wb.save(output_path)
+    wb.close()
 
 
 def build_share_message(client_name: str, sender_name: str) -> str:
     """Return a sample share message for the client."""
-    return (
-        f"Hi {client_name},\n\n"
-        "I've compiled a list of possible job titles and their skills for you."
-        " Your current LinkedIn skills are already marked."
-        " Please review the list and mark 'Yes' in the second column for any"
-        " additional skills you have.\n\n"
-        "Thanks,\n"
-        f"{sender_name}"
-    )
+    return SHARE_MESSAGE_TEMPLATE.format(client=client_name, sender=sender_name)
+
+
+def positive_int(value: str) -> int:
+    """Parse a command-line bound that must be a positive integer."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main() -> None:
@@ -174,7 +269,22 @@ def main() -> None:
         "--sheet",
         type=str,
         default=None,
-        help="Name of the worksheet to process. Defaults to the first sheet.",
+        help=(
+            "Name of the worksheet to process. Defaults to all sheets;"
+            " LinkedIn skills are taken from the first."
+        ),
+    )
+    parser.add_argument(
+        "--max-col",
+        type=positive_int,
+        default=None,
+        help="Last column (1-based) to read skills from. Defaults to all columns.",
+    )
+    parser.add_argument(
+        "--max-row",
+        type=positive_int,
+        default=None,
+        help="Last row (1-based, header included) to read. Defaults to all rows.",
     )
     parser.add_argument(
         "--output",
@@ -209,10 +319,10 @@ def main() -> None:
     else:
         output_path = args.output
 
-    # Read input data
-    df = pd.read_excel(excel_path, sheet_name=args.sheet)
-    linkedin_skills = determine_linkedin_skills(df)
-    unique_skills = extract_unique_skills(excel_path, sheet=args.sheet)
+    # Read input data (the workbook is streamed only once)
+    unique_skills, linkedin_skills = read_skills(
+        excel_path, sheet=args.sheet, max_col=args.max_col, max_row=args.max_row
+    )
 
     # Generate review workbook
     create_review_workbook(unique_skills, linkedin_skills, output_path)
@@ -229,6 +339,9 @@ def process_skills(
     sheet: Optional[str] = None,
     client: str = "Client",
     sender: str = "Your Name",
+    output_path: Union[str, BinaryIO, None] = None,
+    max_col: Optional[int] = None,
+    max_row: Optional[int] = None,
 ) -> dict:
     """
     Process an Excel workbook and generate a review sheet.
@@ -238,29 +351,44 @@ def process_skills(
     excel_path : str
         Path to the source Excel file.
     sheet : str, optional
-        Name of the worksheet to process. Defaults to the first sheet.
+        Name of the worksheet to process. Defaults to all sheets; LinkedIn
+        skills are taken from the first.
     client : str, optional
         The client’s name for the share message.
     sender : str, optional
         Your name for the share message.
+    output_path : str or binary file-like object, optional
+        Where to save the review workbook. Defaults to a file with suffix
+        ``_review.xlsx`` next to the source file. When a file-like object is
+        given, ``output_file`` in the result is ``None``.
+    max_col : int, optional
+        Last column (1-based) to read skills from. Defaults to all columns.
+    max_row : int, optional
+        Last row (1-based, header included) to read. Defaults to all rows.
 
     Returns
     -------
     dict
         A dictionary with keys ``output_file`` and ``message`` containing the path
-        to the generated review workbook and a suggested share message.
+        to the generated review workbook (if saved to a path) and a suggested
+        share message.
     """
     src = Path(excel_path)
     if not src.exists():
         raise FileNotFoundError(f"Input file not found: {src}")
-    # Create output path with suffix _review.xlsx in the same directory
-    output_path = src.with_name(src.stem + "_review.xlsx")
-    df = pd.read_excel(src, sheet_name=sheet)
-    linkedin_skills = determine_linkedin_skills(df)
-    unique_skills = extract_unique_skills(src, sheet=sheet)
+    if output_path is None:
+        # Create output path with suffix _review.xlsx in the same directory
+        output_path = src.with_name(src.stem + "_review.xlsx")
+    unique_skills, linkedin_skills = read_skills(
+        src, sheet=sheet, max_col=max_col, max_row=max_row
+    )
     create_review_workbook(unique_skills, linkedin_skills, output_path)
     message = build_share_message(client, sender)
-    return {"output_file": str(output_path), "message": message}
+    if isinstance(output_path, (str, os.PathLike)):
+        output_file = str(output_path)
+    else:
+        output_file = None
+    return {"output_file": output_file, "message": message}
 
 
 if __name__ == "__main__":